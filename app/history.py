@@ -1,9 +1,141 @@
 """Detection history module for viewing past results."""
 
-from typing import List
-from nicegui import ui, app
+from types import MappingProxyType
+from typing import Dict, List, Optional
+from nicegui import ui, app, run
 from app.services import DetectionService, UserService
-from app.models import DetectionResult, DiseaseType, DetectionStatus
+from app.models import DetectionResult, DiseaseDetection, DiseaseType, DetectionStatus
+
+
+# Number of rows fetched and rendered per table page
+PAGE_SIZE = 25
+
+# Display constants shared by all renders; built once at import instead of per
+# render and frozen so no caller can mutate the shared mapping
+_STATUS_LABELS = MappingProxyType(
+    {
+        DetectionStatus.PENDING: "⏳ Menunggu",
+        DetectionStatus.PROCESSING: "🔄 Memproses",
+        DetectionStatus.COMPLETED: "✅ Selesai",
+        DetectionStatus.FAILED: "❌ Gagal",
+    }
+)
+
+_DISEASE_LABEL = MappingProxyType(
+    {
+        DiseaseType.NORMAL: "✅ Normal",
+        DiseaseType.PNEUMONIA: "⚠️ Pneumonia",
+        DiseaseType.TUBERCULOSIS: "🦠 Tuberkulosis",
+        DiseaseType.COVID19: "🦠 COVID-19",
+        DiseaseType.LUNG_CANCER: "⚠️ Kanker Paru-paru",
+    }
+)
+
+# Plain disease names for the detail dialog (no icons)
+_DISEASE_NAME = MappingProxyType(
+    {
+        DiseaseType.NORMAL: "Normal",
+        DiseaseType.PNEUMONIA: "Pneumonia",
+        DiseaseType.TUBERCULOSIS: "Tuberkulosis",
+        DiseaseType.COVID19: "COVID-19",
+        DiseaseType.LUNG_CANCER: "Kanker Paru-paru",
+    }
+)
+
+# Plain status names for the detail dialog (enum values are ints)
+_STATUS_NAME = MappingProxyType(
+    {
+        DetectionStatus.PENDING: "pending",
+        DetectionStatus.PROCESSING: "processing",
+        DetectionStatus.COMPLETED: "completed",
+        DetectionStatus.FAILED: "failed",
+    }
+)
+
+# Summary tiles: (card background, value classes, label classes, label)
+_SUMMARY_TILES = (
+    ("bg-blue-50", "text-blue-600", "text-blue-800", "Total Deteksi"),
+    ("bg-green-50", "text-green-600", "text-green-800", "Selesai"),
+    ("bg-emerald-50", "text-emerald-600", "text-emerald-800", "Normal"),
+    ("bg-orange-50", "text-orange-600", "text-orange-800", "Indikasi Penyakit"),
+)
+
+# Static table schema, built once; presentational classes live on the column
+# descriptors so Quasar applies them without per-cell slot templates
+_COLUMNS = [
+    {"name": "filename", "label": "File", "field": "filename", "align": "left"},
+    {"name": "status", "label": "Status", "field": "status", "align": "center", "classes": "text-center"},
+    {"name": "result", "label": "Hasil", "field": "result", "align": "left", "classes": "font-medium"},
+    {
+        "name": "confidence",
+        "label": "Kepercayaan",
+        "field": "confidence",
+        "align": "center",
+        "classes": "text-center font-mono font-bold",
+    },
+    # Rows carry ISO timestamps; formatting happens client-side so the server
+    # pays one C-level isoformat() per row instead of a strftime parse
+    {
+        "name": "date",
+        "label": "Tanggal",
+        "field": "date",
+        "align": "center",
+        ":format": "value => Quasar.date.formatDate(value, 'DD/MM/YYYY HH:mm')",
+    },
+]
+
+# Detail-dialog cache: terminal detections never change, so clicking through
+# rows does not re-query the database for rows already seen
+_DETAIL_CACHE: Dict[int, DiseaseDetection] = {}
+_DETAIL_CACHE_MAX = 256
+
+
+def _get_detection_detail(detection_id: int) -> Optional[DiseaseDetection]:
+    """Get a detection for the detail dialog, caching terminal (immutable) states."""
+    detection = _DETAIL_CACHE.get(detection_id)
+    if detection is None:
+        detection = DetectionService.get_detection(detection_id)
+        if detection is not None and detection.status in (DetectionStatus.COMPLETED, DetectionStatus.FAILED):
+            if len(_DETAIL_CACHE) >= _DETAIL_CACHE_MAX:
+                _DETAIL_CACHE.clear()
+            _DETAIL_CACHE[detection_id] = detection
+    return detection
+
+
+# Result-column text per status: one dict dispatch instead of an if/elif ladder per row
+_RESULT_TEXT = {
+    DetectionStatus.COMPLETED: lambda r: (
+        _DISEASE_LABEL.get(r.detected_disease, "❓ Unknown") if r.detected_disease else ""
+    ),
+    DetectionStatus.FAILED: lambda r: "❌ Gagal",
+    DetectionStatus.PENDING: lambda r: "⏳ Menunggu",
+    DetectionStatus.PROCESSING: lambda r: "⏳ Menunggu",
+}
+
+
+def _build_rows(history: List[DetectionResult]) -> List[dict]:
+    """Format a page of detection results into table rows.
+
+    Top-level on purpose: calling a module-level function from the page
+    closures is cheaper than a nested closure (LOAD_GLOBAL vs LOAD_DEREF).
+    """
+    # Format column-wise (one tight comprehension per column), then zip
+    # the columns back into row dicts
+    statuses = [_STATUS_LABELS.get(r.status, "Unknown") for r in history]
+    results = [_RESULT_TEXT[r.status](r) for r in history]
+    confidences = [f"{r.confidence_score * 100:.1f}%" if r.confidence_score else "" for r in history]
+    dates = [r.created_at.isoformat() for r in history]
+    return [
+        {
+            "filename": r.filename,
+            "status": status,
+            "result": result,
+            "confidence": confidence,
+            "date": date,
+            "detection_id": r.detection_id,
+        }
+        for r, status, result, confidence, date in zip(history, statuses, results, confidences, dates)
+    ]
 
 
 def create():
@@ -39,14 +171,23 @@ def create():
                 ui.label(f"👤 {user.name}").classes("font-semibold text-blue-800")
                 ui.label(f"📧 {user.email}").classes("text-blue-600")
 
-            # Get detection history
-            detection_history = DetectionService.get_user_detection_history(user_id)
+            # Reuse the cached payload when nothing changed since the last visit;
+            # the stamp query is a single MAX(updated_at) row
+            stamp = DetectionService.get_user_history_stamp(user_id)
+            cache = app.storage.tab.get("history_cache")
+            if cache is not None and cache["stamp"] == stamp:
+                summary = cache["summary"]
+                cached_rows = cache["rows"]
+            else:
+                summary = DetectionService.get_user_summary(user_id)
+                cached_rows = None
 
-            if not detection_history:
+            if summary["total"] == 0:
                 create_empty_history()
             else:
-                create_history_summary(detection_history)
-                create_detailed_history(detection_history)
+                create_history_summary(summary)
+                first_rows = create_detailed_history(user_id, summary["total"], cached_rows)
+                app.storage.tab["history_cache"] = {"stamp": stamp, "summary": summary, "rows": first_rows}
 
     def create_empty_history():
         """Create empty history display."""
@@ -58,160 +199,108 @@ def create():
                 "bg-primary text-white px-6 py-3 text-lg"
             )
 
-    def create_history_summary(history: List[DetectionResult]):
-        """Create summary statistics."""
-        total_detections = len(history)
-        completed_detections = len([h for h in history if h.status == DetectionStatus.COMPLETED])
-        diseases_detected = len([h for h in history if h.is_disease_detected])
+    def create_history_summary(summary: Dict[str, int]):
+        """Create summary statistics from pre-aggregated counts."""
+        total_detections = summary["total"]
+        completed_detections = summary["completed"]
+        diseases_detected = summary["diseases_detected"]
         normal_results = completed_detections - diseases_detected
 
         with ui.card().classes("p-6 mb-6"):
             ui.label("📈 Ringkasan Statistik").classes("text-xl font-bold mb-4")
 
+            values = (total_detections, completed_detections, normal_results, diseases_detected)
             with ui.row().classes("gap-6 w-full"):
-                # Total detections
-                with ui.card().classes("p-4 bg-blue-50 flex-1 text-center"):
-                    ui.label(str(total_detections)).classes("text-3xl font-bold text-blue-600")
-                    ui.label("Total Deteksi").classes("text-blue-800 font-medium")
-
-                # Completed detections
-                with ui.card().classes("p-4 bg-green-50 flex-1 text-center"):
-                    ui.label(str(completed_detections)).classes("text-3xl font-bold text-green-600")
-                    ui.label("Selesai").classes("text-green-800 font-medium")
-
-                # Normal results
-                with ui.card().classes("p-4 bg-emerald-50 flex-1 text-center"):
-                    ui.label(str(normal_results)).classes("text-3xl font-bold text-emerald-600")
-                    ui.label("Normal").classes("text-emerald-800 font-medium")
-
-                # Disease detected
-                with ui.card().classes("p-4 bg-orange-50 flex-1 text-center"):
-                    ui.label(str(diseases_detected)).classes("text-3xl font-bold text-orange-600")
-                    ui.label("Indikasi Penyakit").classes("text-orange-800 font-medium")
-
-    def create_detailed_history(history: List[DetectionResult]):
-        """Create detailed history table."""
+                for (background, value_color, label_color, label), value in zip(_SUMMARY_TILES, values):
+                    with ui.card().classes(f"p-4 {background} flex-1 text-center"):
+                        ui.label(str(value)).classes(f"text-3xl font-bold {value_color}")
+                        ui.label(label).classes(f"{label_color} font-medium")
+
+    def create_detailed_history(user_id: int, total: int, cached_rows: Optional[List[dict]] = None) -> List[dict]:
+        """Create detailed history table with server-side pagination.
+
+        Returns the first-page rows so the caller can cache them.
+        """
         with ui.card().classes("p-6"):
             ui.label("📋 Detail Riwayat").classes("text-xl font-bold mb-4")
 
-            # Disease type colors and labels
-            disease_info = {
-                DiseaseType.NORMAL: {"color": "#10b981", "label": "✅ Normal"},
-                DiseaseType.PNEUMONIA: {"color": "#f59e0b", "label": "⚠️ Pneumonia"},
-                DiseaseType.TUBERCULOSIS: {"color": "#ef4444", "label": "🦠 Tuberkulosis"},
-                DiseaseType.COVID19: {"color": "#8b5cf6", "label": "🦠 COVID-19"},
-                DiseaseType.LUNG_CANCER: {"color": "#dc2626", "label": "⚠️ Kanker Paru-paru"},
-            }
-
-            # Status colors (referenced for potential future use)
-            # status_colors = {
-            #     DetectionStatus.PENDING: '#f59e0b',
-            #     DetectionStatus.PROCESSING: '#3b82f6',
-            #     DetectionStatus.COMPLETED: '#10b981',
-            #     DetectionStatus.FAILED: '#ef4444'
-            # }
-
-            # Prepare table data
-            columns = [
-                {"name": "filename", "label": "File", "field": "filename", "align": "left"},
-                {"name": "status", "label": "Status", "field": "status", "align": "center"},
-                {"name": "result", "label": "Hasil", "field": "result", "align": "left"},
-                {"name": "confidence", "label": "Kepercayaan", "field": "confidence", "align": "center"},
-                {"name": "date", "label": "Tanggal", "field": "date", "align": "center"},
-            ]
-
-            rows = []
-            for result in history:
-                # Format status
-                status_labels = {
-                    DetectionStatus.PENDING: "⏳ Menunggu",
-                    DetectionStatus.PROCESSING: "🔄 Memproses",
-                    DetectionStatus.COMPLETED: "✅ Selesai",
-                    DetectionStatus.FAILED: "❌ Gagal",
-                }
-
-                # Format result
-                result_text = ""
-                if result.status == DetectionStatus.COMPLETED and result.detected_disease:
-                    disease_data = disease_info.get(result.detected_disease, {"label": "❓ Unknown"})
-                    result_text = disease_data["label"]
-                elif result.status == DetectionStatus.FAILED:
-                    result_text = "❌ Gagal"
-                elif result.status in [DetectionStatus.PENDING, DetectionStatus.PROCESSING]:
-                    result_text = "⏳ Menunggu"
-
-                # Format confidence
-                confidence_text = ""
-                if result.confidence_score:
-                    confidence_pct = float(result.confidence_score) * 100
-                    confidence_text = f"{confidence_pct:.1f}%"
-
-                rows.append(
-                    {
-                        "filename": result.filename,
-                        "status": status_labels.get(result.status, "Unknown"),
-                        "result": result_text,
-                        "confidence": confidence_text,
-                        "date": result.created_at.strftime("%d/%m/%Y %H:%M"),
-                        "detection_id": result.detection_id,
-                    }
-                )
+            # Create table with server-side pagination: only one page of rows is
+            # fetched from the database and shipped to the client at a time
+            if cached_rows is None:
+                first_rows = _build_rows(DetectionService.get_user_detection_history(user_id, limit=PAGE_SIZE))
+            else:
+                first_rows = cached_rows
+            table = ui.table(
+                columns=list(_COLUMNS),  # shallow copy in case the element mutates its list
+                rows=first_rows,
+                pagination={"rowsPerPage": PAGE_SIZE, "rowsNumber": total, "page": 1},
+            ).classes("w-full")
+            # Virtual scrolling keeps the DOM at O(viewport) rows even in "all" mode
+            # (rows-per-page option 0); off-screen rows are never materialized
+            table.props(
+                'flat bordered virtual-scroll :virtual-scroll-sticky-size-start="48" '
+                ':rows-per-page-options="[25, 50, 100, 0]"'
+            )
+            table.style("max-height: 70vh")
 
-            # Create table
-            table = ui.table(columns=columns, rows=rows).classes("w-full")
-            table.props("flat bordered")
+            async def handle_request(e):
+                """Fetch the requested page from the database and update the table.
 
-            # Add custom styling for better appearance
-            table.add_slot(
-                "body-cell-status",
+                The fetch and row formatting run in a worker thread so a large
+                "all rows" request does not stall the event loop; the payload
+                itself is serialized by NiceGUI's orjson-backed encoder.
                 """
-                <q-td :props="props">
-                    <div class="text-center">{{ props.value }}</div>
-                </q-td>
-            """,
-            )
+                pagination = e.args["pagination"]
+                page = pagination.get("page", 1)
+                rows_per_page = pagination.get("rowsPerPage", PAGE_SIZE)
+                rows = await run.io_bound(
+                    lambda: _build_rows(
+                        DetectionService.get_user_detection_history(
+                            user_id,
+                            limit=rows_per_page or None,  # rowsPerPage == 0 means "all"
+                            offset=(page - 1) * (rows_per_page or total),
+                        )
+                    )
+                )
+                # run.io_bound is typed Optional but only returns None when the
+                # callable does; _build_rows always returns a list
+                table.rows = rows or []
+                table.pagination = pagination
+                table.update()
 
-            table.add_slot(
-                "body-cell-result",
-                """
-                <q-td :props="props">
-                    <div class="font-medium">{{ props.value }}</div>
-                </q-td>
-            """,
-            )
+            table.on("request", handle_request)
 
-            table.add_slot(
-                "body-cell-confidence",
-                """
-                <q-td :props="props">
-                    <div class="text-center font-mono font-bold">{{ props.value }}</div>
-                </q-td>
-            """,
-            )
+            # One dialog per page, reused across row clicks: only its contents
+            # are rebuilt instead of mounting/unmounting a dialog per click
+            with ui.dialog() as detail_dialog, ui.card().classes("w-96 max-w-full") as detail_card:
+                pass
 
             # Add click handler for row selection
             def handle_row_click(e):
                 """Handle table row click for detailed view."""
                 row_data = e.args[1]  # Get the row data
                 detection_id = row_data["detection_id"]
-                show_detection_details(detection_id)
+                show_detection_details(detection_id, detail_dialog, detail_card)
 
             table.on("rowClick", handle_row_click)
 
-    def show_detection_details(detection_id: int):
-        """Show detailed detection information in a dialog."""
-        detection = DetectionService.get_detection(detection_id)
+            return first_rows
+
+    def show_detection_details(detection_id: int, dialog: ui.dialog, card: ui.card):
+        """Show detailed detection information in the page's shared dialog."""
+        detection = _get_detection_detail(detection_id)
         if detection is None:
             ui.notify("Detail deteksi tidak ditemukan", type="negative")
             return
 
-        with ui.dialog() as dialog, ui.card().classes("w-96 max-w-full"):
+        card.clear()
+        with card:
             ui.label("🔍 Detail Deteksi").classes("text-xl font-bold mb-4")
 
             # Basic info
             with ui.column().classes("gap-2 mb-4"):
                 ui.label(f"ID Deteksi: {detection.id}").classes("text-sm")
-                ui.label(f"Status: {detection.status.value}").classes("text-sm")
+                ui.label(f"Status: {_STATUS_NAME[detection.status]}").classes("text-sm")
                 ui.label(f"Model: {detection.model_name} v{detection.model_version}").classes("text-sm")
 
                 if detection.processing_started_at:
@@ -233,20 +322,10 @@ def create():
                 ui.label("📊 Hasil Deteksi").classes("font-bold mb-2")
 
                 if detection.detected_disease:
-                    disease_labels = {
-                        DiseaseType.NORMAL: "Normal",
-                        DiseaseType.PNEUMONIA: "Pneumonia",
-                        DiseaseType.TUBERCULOSIS: "Tuberkulosis",
-                        DiseaseType.COVID19: "COVID-19",
-                        DiseaseType.LUNG_CANCER: "Kanker Paru-paru",
-                    }
-                    ui.label(f"Penyakit: {disease_labels.get(detection.detected_disease, 'Unknown')}").classes(
-                        "text-sm"
-                    )
+                    ui.label(f"Penyakit: {_DISEASE_NAME.get(detection.detected_disease, 'Unknown')}").classes("text-sm")
 
                 if detection.confidence_score:
-                    confidence_pct = float(detection.confidence_score) * 100
-                    ui.label(f"Kepercayaan: {confidence_pct:.2f}%").classes("text-sm")
+                    ui.label(f"Kepercayaan: {detection.confidence_score * 100:.2f}%").classes("text-sm")
 
                 ui.label(f"Ada Penyakit: {'Ya' if detection.is_disease_detected else 'Tidak'}").classes("text-sm")
 
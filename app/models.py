@@ -1,23 +1,27 @@
-from sqlmodel import SQLModel, Field, Relationship, JSON, Column
+from sqlmodel import SQLModel, Field, Relationship, JSON, Column, Index
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from decimal import Decimal
 from enum import Enum
 
 
-class DetectionStatus(str, Enum):
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
+# Int-valued enums: comparisons in row loops are machine-int compares.
+# (SQLModel still maps these through sa.Enum, so the columns store the
+# member names as VARCHAR — the win is Python-side only.) Values start
+# at 1 so every member is truthy; `if detection.detected_disease` style
+# checks in the UI rely on that.
+class DetectionStatus(int, Enum):
+    PENDING = 1
+    PROCESSING = 2
+    COMPLETED = 3
+    FAILED = 4
 
 
-class DiseaseType(str, Enum):
-    PNEUMONIA = "pneumonia"
-    TUBERCULOSIS = "tuberculosis"
-    COVID19 = "covid19"
-    LUNG_CANCER = "lung_cancer"
-    NORMAL = "normal"
+class DiseaseType(int, Enum):
+    PNEUMONIA = 1
+    TUBERCULOSIS = 2
+    COVID19 = 3
+    LUNG_CANCER = 4
+    NORMAL = 5
 
 
 # Persistent models (stored in database)
@@ -47,10 +51,11 @@ class XrayImage(SQLModel, table=True):
     mime_type: str = Field(max_length=100, default="image/jpeg")
     width: Optional[int] = Field(default=None, description="Image width in pixels")
     height: Optional[int] = Field(default=None, description="Image height in pixels")
-    upload_date: datetime = Field(default_factory=datetime.utcnow)
+    upload_date: datetime = Field(default_factory=datetime.utcnow, index=True)
     user_id: int = Field(foreign_key="users.id")
 
-    # Image metadata
+    # Image metadata, reserved for genuinely dynamic fields; known attributes
+    # like the upload time belong in typed columns (upload_date above)
     image_metadata: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
 
     # Relationships
@@ -60,16 +65,23 @@ class XrayImage(SQLModel, table=True):
 
 class DiseaseDetection(SQLModel, table=True):
     __tablename__ = "disease_detections"  # type: ignore[assignment]
+    __table_args__ = (
+        # Covers the per-user summary aggregates (count/completed/detected)
+        # as an index-only scan now that the summary filters on user_id
+        Index("ix_dd_user_status_disease", "user_id", "status", "is_disease_detected"),
+        # Per-user history: single-table range scan ordered by recency
+        Index("ix_dd_user_created", "user_id", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     xray_image_id: int = Field(foreign_key="xray_images.id")
+    # Denormalized from the owning image so per-user queries skip the JOIN
+    user_id: int = Field(foreign_key="users.id")
     status: DetectionStatus = Field(default=DetectionStatus.PENDING)
 
     # Detection results
     detected_disease: Optional[DiseaseType] = Field(default=None)
-    confidence_score: Optional[Decimal] = Field(
-        default=None, decimal_places=4, max_digits=6, description="Confidence score between 0.0000 and 1.0000"
-    )
+    confidence_score: Optional[float] = Field(default=None, description="Confidence score between 0.0 and 1.0")
     is_disease_detected: bool = Field(default=False)
 
     # Processing information
@@ -139,7 +151,7 @@ class DiseaseDetectionCreate(SQLModel, table=False):
 class DiseaseDetectionUpdate(SQLModel, table=False):
     status: Optional[DetectionStatus] = Field(default=None)
     detected_disease: Optional[DiseaseType] = Field(default=None)
-    confidence_score: Optional[Decimal] = Field(default=None, decimal_places=4, max_digits=6)
+    confidence_score: Optional[float] = Field(default=None)
     is_disease_detected: Optional[bool] = Field(default=None)
     processing_completed_at: Optional[datetime] = Field(default=None)
     processing_duration_seconds: Optional[int] = Field(default=None)
@@ -153,7 +165,7 @@ class DetectionResult(SQLModel, table=False):
     filename: str
     status: DetectionStatus
     detected_disease: Optional[DiseaseType]
-    confidence_score: Optional[Decimal]
+    confidence_score: Optional[float]
     is_disease_detected: bool
     processing_completed_at: Optional[datetime]
     created_at: datetime
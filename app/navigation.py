@@ -1,7 +1,30 @@
 """Navigation module for the application."""
 
+import time
+
 from nicegui import ui, app
 
+# Clicks on the same navigation button within this window are coalesced
+_NAV_DEBOUNCE_S = 0.25
+
+
+def _debounced_nav(path: str, debounce_s: float = _NAV_DEBOUNCE_S):
+    """Return a click handler that navigates to `path` at most once per debounce window.
+
+    Rapid double-clicks otherwise trigger duplicate navigations, each of which
+    re-renders the target page (and re-queries the database for /history).
+    """
+    last = 0.0
+
+    def go() -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= debounce_s:
+            last = now
+            ui.navigate.to(path)
+
+    return go
+
 
 def create():
     """Create navigation UI components."""
@@ -32,17 +55,17 @@ def create():
 
                 if user_id:
                     with ui.row().classes("gap-2"):
-                        ui.button("Deteksi", on_click=lambda: ui.navigate.to("/detection")).classes(
+                        ui.button("Deteksi", on_click=_debounced_nav("/detection")).classes(
                             "bg-primary text-white px-4 py-2"
                         )
-                        ui.button("Riwayat", on_click=lambda: ui.navigate.to("/history")).classes(
+                        ui.button("Riwayat", on_click=_debounced_nav("/history")).classes(
                             "bg-secondary text-white px-4 py-2"
                         )
                         ui.button("Logout", on_click=logout).classes("bg-gray-500 text-white px-4 py-2").props(
                             "outline"
                         )
                 else:
-                    ui.button("Mulai", on_click=lambda: ui.navigate.to("/user-setup")).classes(
+                    ui.button("Mulai", on_click=_debounced_nav("/user-setup")).classes(
                         "bg-primary text-white px-6 py-2 text-lg"
                     )
 
@@ -58,15 +81,15 @@ def create():
                     ).classes("text-xl text-gray-600 max-w-3xl mx-auto leading-relaxed")
 
                     if not user_id:
-                        ui.button("Mulai Deteksi Sekarang", on_click=lambda: ui.navigate.to("/user-setup")).classes(
+                        ui.button("Mulai Deteksi Sekarang", on_click=_debounced_nav("/user-setup")).classes(
                             "bg-primary text-white px-8 py-4 text-xl font-semibold rounded-lg shadow-lg hover:shadow-xl transition-shadow mt-4"
                         )
                     else:
                         with ui.row().classes("gap-4 mt-4"):
-                            ui.button("Upload X-ray", on_click=lambda: ui.navigate.to("/detection")).classes(
+                            ui.button("Upload X-ray", on_click=_debounced_nav("/detection")).classes(
                                 "bg-primary text-white px-8 py-4 text-xl font-semibold rounded-lg shadow-lg hover:shadow-xl transition-shadow"
                             )
-                            ui.button("Lihat Riwayat", on_click=lambda: ui.navigate.to("/history")).classes(
+                            ui.button("Lihat Riwayat", on_click=_debounced_nav("/history")).classes(
                                 "bg-secondary text-white px-8 py-4 text-xl font-semibold rounded-lg shadow-lg hover:shadow-xl transition-shadow"
                             )
 
@@ -134,7 +157,7 @@ def create():
     def create_navigation_header(current_page: str = ""):
         """Create navigation header for other pages."""
         with ui.row().classes("w-full justify-between items-center p-4 bg-white shadow-sm mb-6"):
-            ui.button("🫁", on_click=lambda: ui.navigate.to("/")).classes("text-2xl").props("flat")
+            ui.button("🫁", on_click=_debounced_nav("/")).classes("text-2xl").props("flat")
             ui.label("X-ray Lung Disease Detection").classes("text-xl font-bold text-gray-800")
 
             with ui.row().classes("gap-2"):
@@ -147,7 +170,7 @@ def create():
                     else:
                         classes += " text-gray-600"
 
-                    ui.button(item["label"], on_click=lambda _=None, p=item["path"]: ui.navigate.to(p)).classes(classes)
+                    ui.button(item["label"], on_click=_debounced_nav(item["path"])).classes(classes)
 
                 ui.button("Logout", on_click=logout).classes("bg-gray-500 text-white px-4 py-2").props("outline")
 
@@ -4,12 +4,17 @@ import app.xray_detection
 import app.history
 
 
+def register_pages() -> None:
+    """Register all UI modules."""
+    app.navigation.create()
+    app.xray_detection.create()
+    app.history.create()
+
+
 def startup() -> None:
     """Initialize the application."""
     # Create database tables
     create_tables()
 
     # Register all UI modules
-    app.navigation.create()
-    app.xray_detection.create()
-    app.history.create()
+    register_pages()
@@ -1,12 +1,64 @@
 """Main X-ray detection UI module."""
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Optional
-from nicegui import ui, events, app
+from nicegui import ui, events, app, run
 from app.services import UserService, ImageService, DetectionService
 from app.models import User, DiseaseType, DetectionStatus
 
 
+# Card display constants, built once at import instead of per card render and
+# frozen so no caller can mutate the shared mappings
+STATUS_COLORS = MappingProxyType(
+    {
+        DetectionStatus.PENDING: "border-yellow-400 bg-yellow-50",
+        DetectionStatus.PROCESSING: "border-blue-400 bg-blue-50",
+        DetectionStatus.COMPLETED: "border-green-400 bg-green-50",
+        DetectionStatus.FAILED: "border-red-400 bg-red-50",
+    }
+)
+
+DISEASE_INFO = MappingProxyType(
+    {
+        DiseaseType.NORMAL: {"color": "text-green-600", "icon": "✅", "label": "Normal"},
+        DiseaseType.PNEUMONIA: {"color": "text-orange-600", "icon": "⚠️", "label": "Pneumonia"},
+        DiseaseType.TUBERCULOSIS: {"color": "text-red-600", "icon": "🦠", "label": "Tuberkulosis"},
+        DiseaseType.COVID19: {"color": "text-purple-600", "icon": "🦠", "label": "COVID-19"},
+        DiseaseType.LUNG_CANCER: {"color": "text-red-800", "icon": "⚠️", "label": "Kanker Paru-paru"},
+    }
+)
+
+_UNKNOWN_DISEASE = MappingProxyType({"color": "text-gray-600", "icon": "❓", "label": "Unknown"})
+
+# Dedicated pool for upload saves (hash + disk write + header probe), sized
+# for I/O concurrency, so uploads neither block the event loop nor queue
+# behind unrelated work in the shared default executor
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="xray-upload")
+
+# The detection page shows only the most recent results; the history page
+# paginates through everything
+_RESULT_LIMIT = 50
+
+# At most this many simulated analyses run at once; uploads beyond the limit
+# queue on the semaphore instead of each holding a DB session
+_MAX_CONCURRENT_DETECTIONS = 5
+_DETECTION_SEMAPHORE = asyncio.Semaphore(_MAX_CONCURRENT_DETECTIONS)
+
+# Keep strong references to in-flight tasks (asyncio only holds weak ones)
+_PENDING_TASKS: set[asyncio.Task] = set()
+
+_STATUS_LABELS = MappingProxyType(
+    {
+        DetectionStatus.PENDING: ("⏳", "Menunggu"),
+        DetectionStatus.PROCESSING: ("🔄", "Memproses"),
+        DetectionStatus.COMPLETED: ("✅", "Selesai"),
+        DetectionStatus.FAILED: ("❌", "Gagal"),
+    }
+)
+
+
 def create():
     """Create X-ray detection UI module."""
 
@@ -58,8 +110,29 @@ def create():
             await create_upload_section(user.id)
 
             # Results section
+            user_id = user.id
             results_container = ui.column().classes("w-full")
-            await refresh_results(user.id, results_container)
+            pending_slots = await refresh_results(user_id, results_container)
+
+            # One page-scoped poll for all in-flight detections: a status-only
+            # query per tick, rebuilding just the cards that finished instead
+            # of reloading the whole page per pending card
+            async def poll_pending():
+                still_pending = DetectionService.get_pending_detection_ids(user_id)
+                # keys() - set builds the finished-id set directly, without an
+                # intermediate filtered list
+                for detection_id in pending_slots.keys() - set(still_pending):
+                    slot = pending_slots.pop(detection_id)
+                    result = DetectionService.get_detection_result(detection_id)
+                    slot.clear()
+                    if result is not None:
+                        with slot:
+                            create_result_card(result)
+                if not pending_slots:
+                    poll_timer.cancel()
+
+            if pending_slots:
+                poll_timer = ui.timer(3.0, poll_pending)
 
     @ui.page("/user-setup")
     def user_setup_page():
@@ -141,7 +214,7 @@ def create():
                 "border-2 border-dashed border-gray-300 rounded-lg p-8 text-center hover:border-blue-400 transition-colors"
             )
 
-    def handle_upload(e: events.UploadEventArguments, user_id: int):
+    async def handle_upload(e: events.UploadEventArguments, user_id: int):
         """Handle X-ray image upload."""
         try:
             ui.notify("Memulai upload...", type="info")
@@ -151,24 +224,34 @@ def create():
                 ui.notify("Format file tidak didukung. Gunakan JPG, JPEG, atau PNG.", type="negative")
                 return
 
-            content_bytes = e.content.read()
-            if len(content_bytes) > 10 * 1024 * 1024:  # 10MB limit
+            # Stream the upload to disk on the upload pool: the file is hashed
+            # and written chunk by chunk instead of buffered whole in memory,
+            # and the size limit is enforced inside the loop
+            try:
+                xray_image = await asyncio.get_running_loop().run_in_executor(
+                    _UPLOAD_EXECUTOR, ImageService.save_uploaded_stream, e.content, e.name, user_id
+                )
+            except ValueError:
                 ui.notify("Ukuran file terlalu besar. Maksimal 10MB.", type="negative")
                 return
 
-            # Save image
-            xray_image = ImageService.save_uploaded_image(content_bytes, e.name, user_id)
-
             ui.notify("✅ Citra berhasil diupload!", type="positive")
 
             # Start detection
             if xray_image.id is not None:
-                detection = DetectionService.start_detection(xray_image.id)
+                detection = DetectionService.start_detection(xray_image.id, user_id=user_id)
                 ui.notify("🔍 Memulai proses deteksi...", type="info")
 
-                # Process detection asynchronously
+                # Process detection asynchronously, handing the created row
+                # forward so processing does not re-fetch what it just inserted
                 if detection.id is not None:
-                    asyncio.create_task(process_detection_async(detection.id, user_id))
+                    task = asyncio.create_task(process_detection_async(detection, user_id))
+                    _PENDING_TASKS.add(task)
+                    task.add_done_callback(_PENDING_TASKS.discard)
+
+                    # Re-render once so the new pending card (and the page's
+                    # poll timer) pick up this detection
+                    ui.navigate.to("/detection")
             else:
                 ui.notify("❌ Error: ID gambar tidak valid", type="negative")
 
@@ -178,15 +261,14 @@ def create():
             logging.error(f"Error during upload: {str(ex)}")
             ui.notify(f"Error upload: {str(ex)}", type="negative")
 
-    async def process_detection_async(detection_id: int, user_id: int):
+    async def process_detection_async(detection, user_id: int):
         """Process detection asynchronously and refresh results."""
+        detection_id = detection.id or 0
         try:
-            await DetectionService.process_detection(detection_id)
+            async with _DETECTION_SEMAPHORE:
+                await DetectionService.process_detection(detection_id, detection)
             ui.notify("✅ Deteksi selesai!", type="positive")
-
-            # Find and refresh results container
-            # Note: In a real app, you'd use a more robust way to refresh the UI
-            ui.navigate.to("/detection")  # Simple refresh approach
+            # The page's poll timer picks up the finished card; no reload needed
 
         except Exception as e:
             import logging
@@ -195,47 +277,46 @@ def create():
             await DetectionService.mark_detection_failed(detection_id, str(e))
             ui.notify(f"❌ Deteksi gagal: {str(e)}", type="negative")
 
-    async def refresh_results(user_id: int, container: ui.column):
-        """Refresh detection results display."""
+    async def refresh_results(user_id: int, container: ui.column) -> dict[int, ui.column]:
+        """Refresh detection results display.
+
+        Returns a slot container per pending/processing detection so the
+        page's poll timer can rebuild just those cards when they finish.
+        """
+        pending_slots: dict[int, ui.column] = {}
         with container:
             container.clear()
 
-            # Get detection history
-            detection_history = DetectionService.get_user_detection_history(user_id)
+            # Fetch the most recent detections in a worker thread so the query
+            # never stalls the event loop; card building itself is synchronous
+            # widget construction and must stay in slot order
+            detection_history = await run.io_bound(
+                DetectionService.get_user_detection_history, user_id, limit=_RESULT_LIMIT
+            )
 
             if not detection_history:
                 with ui.card().classes("p-6 text-center"):
                     ui.icon("image_search").classes("text-6xl text-gray-400 mb-4")
                     ui.label("Belum ada deteksi").classes("text-xl text-gray-500 mb-2")
                     ui.label("Upload citra X-ray untuk memulai deteksi").classes("text-gray-400")
-                return
+                return pending_slots
 
             ui.label("📊 Riwayat Deteksi").classes("text-xl font-bold mb-4")
 
-            # Display results
+            # Display results; in-flight ones get their own slot for updates
             for result in detection_history:
-                await create_result_card(result)
+                if result.status in (DetectionStatus.PENDING, DetectionStatus.PROCESSING):
+                    slot = ui.column().classes("w-full")
+                    with slot:
+                        create_result_card(result)
+                    pending_slots[result.detection_id] = slot
+                else:
+                    create_result_card(result)
+        return pending_slots
 
-    async def create_result_card(result):
+    def create_result_card(result):
         """Create a result card for detection result."""
-        # Status colors
-        status_colors = {
-            DetectionStatus.PENDING: "border-yellow-400 bg-yellow-50",
-            DetectionStatus.PROCESSING: "border-blue-400 bg-blue-50",
-            DetectionStatus.COMPLETED: "border-green-400 bg-green-50",
-            DetectionStatus.FAILED: "border-red-400 bg-red-50",
-        }
-
-        # Disease colors and icons
-        disease_info = {
-            DiseaseType.NORMAL: {"color": "text-green-600", "icon": "✅", "label": "Normal"},
-            DiseaseType.PNEUMONIA: {"color": "text-orange-600", "icon": "⚠️", "label": "Pneumonia"},
-            DiseaseType.TUBERCULOSIS: {"color": "text-red-600", "icon": "🦠", "label": "Tuberkulosis"},
-            DiseaseType.COVID19: {"color": "text-purple-600", "icon": "🦠", "label": "COVID-19"},
-            DiseaseType.LUNG_CANCER: {"color": "text-red-800", "icon": "⚠️", "label": "Kanker Paru-paru"},
-        }
-
-        card_class = f"p-6 border-l-4 {status_colors.get(result.status, 'border-gray-400 bg-gray-50')}"
+        card_class = f"p-6 border-l-4 {STATUS_COLORS.get(result.status, 'border-gray-400 bg-gray-50')}"
 
         with ui.card().classes(card_class):
             # Header
@@ -247,20 +328,12 @@ def create():
                     )
 
                 # Status badge
-                status_labels = {
-                    DetectionStatus.PENDING: ("⏳", "Menunggu"),
-                    DetectionStatus.PROCESSING: ("🔄", "Memproses"),
-                    DetectionStatus.COMPLETED: ("✅", "Selesai"),
-                    DetectionStatus.FAILED: ("❌", "Gagal"),
-                }
-                icon, label = status_labels.get(result.status, ("❓", "Unknown"))
+                icon, label = _STATUS_LABELS.get(result.status, ("❓", "Unknown"))
                 ui.label(f"{icon} {label}").classes("px-3 py-1 rounded-full text-sm font-medium bg-white")
 
             # Results
             if result.status == DetectionStatus.COMPLETED and result.detected_disease:
-                disease_data = disease_info.get(
-                    result.detected_disease, {"color": "text-gray-600", "icon": "❓", "label": "Unknown"}
-                )
+                disease_data = DISEASE_INFO.get(result.detected_disease, _UNKNOWN_DISEASE)
 
                 with ui.row().classes("gap-6 mb-4"):
                     # Disease result
@@ -274,8 +347,7 @@ def create():
                     if result.confidence_score:
                         with ui.column():
                             ui.label("Tingkat Kepercayaan:").classes("text-sm font-medium text-gray-700")
-                            confidence_pct = float(result.confidence_score) * 100
-                            ui.label(f"{confidence_pct:.1f}%").classes("text-xl font-bold")
+                            ui.label(f"{result.confidence_score * 100:.1f}%").classes("text-xl font-bold")
 
                 # Health status
                 if result.is_disease_detected:
@@ -293,7 +365,5 @@ def create():
                 ui.label("❌ Proses deteksi gagal").classes("text-red-600 font-medium")
 
             elif result.status in [DetectionStatus.PENDING, DetectionStatus.PROCESSING]:
+                # The page-level poll timer swaps this card out when it finishes
                 ui.label("🔄 Sedang memproses...").classes("text-blue-600 font-medium")
-
-                # Auto-refresh for pending/processing results
-                ui.timer(3.0, lambda: ui.navigate.to("/detection"))
@@ -0,0 +1,31 @@
+"""Regenerate the binary image fixtures under tests/fixtures.
+
+Run once whenever the fixture shapes change; the committed files let the test
+suite skip PIL encoding entirely.
+"""
+
+import io
+from pathlib import Path
+from PIL import Image
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def main() -> None:
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Grayscale chest-X-ray sized PNG used by the integration tests; zlib
+    # level 1 keeps regeneration fast (the constant image compresses to a few
+    # KB at any level)
+    png = io.BytesIO()
+    Image.new("L", (1024, 1024), color=128).save(png, format="PNG", optimize=False, compress_level=1)
+    (FIXTURES_DIR / "xray_1024.png").write_bytes(png.getvalue())
+
+    # Smaller JPEG used by the service tests
+    jpg = io.BytesIO()
+    Image.new("RGB", (512, 512), color="gray").save(jpg, format="JPEG")
+    (FIXTURES_DIR / "xray_512.jpg").write_bytes(jpg.getvalue())
+
+
+if __name__ == "__main__":
+    main()
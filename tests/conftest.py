@@ -1,12 +1,150 @@
+import os
+
+# Tests run against in-memory SQLite unless a database URL is provided; this
+# must be set before app.database builds its engine at import time. The
+# sqlite branch of app.database uses a StaticPool with check_same_thread
+# disabled, so every session shares the single in-memory connection and all
+# schema and row work is pure RAM manipulation — no file I/O or fsyncs.
+# Under pytest-xdist every worker is its own process, so the in-memory
+# default is per-worker isolated for free; a file-backed SQLite override
+# gets a per-worker suffix so workers do not share one file.
+os.environ.setdefault("APP_DATABASE_URL", "sqlite://")
+_xdist_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _xdist_worker and os.environ["APP_DATABASE_URL"].startswith("sqlite:///"):
+    os.environ["APP_DATABASE_URL"] += f".{_xdist_worker}"
+
+from pathlib import Path
 from typing import Generator
 import pytest
-from app.startup import startup
+from sqlmodel import SQLModel, Session, delete
+
+from app import database, services
+from app.database import ENGINE, create_tables
+from app.models import UserCreate
+from app.startup import register_pages
 from nicegui.testing import User
 
 pytest_plugins = ["nicegui.testing.plugin"]
 
 
+def _wipe_tables() -> None:
+    """Delete all rows in FK-safe order; much cheaper than DROP/CREATE."""
+    with ENGINE.begin() as connection:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            connection.execute(delete(table))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    """Create missing tables once per session and start from empty rows."""
+    create_tables()
+    _wipe_tables()
+    yield
+
+
+@pytest.fixture(scope="session")
+def default_user():
+    """Canonical user record created once per session.
+
+    Request it as a direct test parameter (not via getfixturevalue inside
+    the test body): session-scoped fixtures then instantiate before new_db
+    patches get_session, so the insert commits for real and survives the
+    per-test rollbacks. The email is distinct from the addresses mutating
+    tests create.
+    """
+    return services.UserService.create_user(UserCreate(name="Test User", email="default.user@test.com"))
+
+
+@pytest.fixture(scope="session")
+def sample_image_bytes():
+    """Load the precomputed sample JPEG (see scripts/gen_fixtures.py).
+
+    The encode happened once when the fixture file was committed, so each
+    xdist worker only pays a single small file read per session; no
+    cross-worker locking is needed.
+    """
+    return (Path(__file__).parent / "fixtures" / "xray_512.jpg").read_bytes()
+
+
+@pytest.fixture(autouse=True)
+def fast_detection(monkeypatch):
+    """Skip the simulated 2s AI-processing wait in process_detection.
+
+    The recorded processing_duration_seconds is a literal in the service, so
+    no clock freezing is needed for the duration assertions. Saves ~2s per
+    process_detection call.
+    """
+
+    async def instant_sleep(seconds):
+        return None
+
+    monkeypatch.setattr("app.services.asyncio.sleep", instant_sleep)
+
+
+@pytest.fixture(autouse=True)
+def storage(monkeypatch) -> services.InMemoryStorage:
+    """Route image storage to a fresh in-memory backend for each test.
+
+    Uploads become dict inserts instead of disk writes; tests that assert on
+    stored files query this backend instead of the filesystem.
+    """
+    backend = services.InMemoryStorage()
+    monkeypatch.setattr(services, "STORAGE", backend)
+    return backend
+
+
+@pytest.fixture()
+def new_db(request, monkeypatch):
+    """Run a test inside a transaction that is rolled back on teardown.
+
+    Service sessions join the test's connection in SAVEPOINT mode, so their
+    commits release savepoints instead of persisting; rolling back the outer
+    transaction undoes everything without any per-test DDL. Tests marked
+    needs_full_reset (global-state mutations such as DDL) get a fresh schema
+    first; none currently do, so the cheap path is the norm.
+    """
+    if request.node.get_closest_marker("needs_full_reset"):
+        database.reset_db()
+    connection = ENGINE.connect()
+    transaction = connection.begin()
+
+    def session_for_test():
+        return Session(connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+    monkeypatch.setattr(database, "get_session", session_for_test)
+    monkeypatch.setattr(services, "get_session", session_for_test)
+    yield
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="class")
+def class_db():
+    """Class-scoped variant of new_db for read-only test groups.
+
+    Seed data created once per class lives in the same rolled-back
+    transaction, so a class of lookups pays for one insert pass.
+    """
+    connection = ENGINE.connect()
+    transaction = connection.begin()
+    patcher = pytest.MonkeyPatch()
+
+    def session_for_test():
+        return Session(connection, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+    patcher.setattr(database, "get_session", session_for_test)
+    patcher.setattr(services, "get_session", session_for_test)
+    patcher.setattr(services, "STORAGE", services.InMemoryStorage())
+    yield
+    patcher.undo()
+    transaction.rollback()
+    connection.close()
+
+
 @pytest.fixture
 def user(user: User) -> Generator[User, None, None]:
-    startup()
+    # The nicegui testing plugin resets the app between tests, so pages must
+    # be re-registered per test; the schema DDL from full startup() is already
+    # covered once per session by _schema
+    register_pages()
     yield user
@@ -0,0 +1,56 @@
+"""Shared helpers for seeding test data in bulk."""
+
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+from app import database
+from app.models import User, XrayImage, DiseaseDetection, DetectionStatus
+
+
+def bulk_seed(
+    users: Sequence[User],
+    images: Sequence[Tuple[int, str]] = (),
+    detections: Sequence[int] = (),
+) -> Tuple[List[User], List[XrayImage], List[DiseaseDetection]]:
+    """Insert users, images and detections in one session and one commit.
+
+    `images` is a list of (user index, filename) pairs and `detections` a
+    list of image indexes; each stage is flushed so the next can reference
+    the generated IDs. Setup-heavy tests pay for a single transaction
+    instead of one per service call.
+    """
+    # Resolved at call time so the fixtures' patched get_session is picked up
+    with database.get_session() as session:
+        user_rows = list(users)
+        session.add_all(user_rows)
+        session.flush()
+
+        image_rows = [
+            XrayImage(
+                filename=name,
+                original_filename=name,
+                file_path=f"uploads/xray_images/{name}",
+                file_size=0,
+                mime_type="image/png",
+                user_id=user_rows[user_index].id or 0,
+            )
+            for user_index, name in images
+        ]
+        session.add_all(image_rows)
+        session.flush()
+
+        now = datetime.now()
+        detection_rows = [
+            DiseaseDetection(
+                xray_image_id=image_rows[image_index].id or 0,
+                user_id=image_rows[image_index].user_id,
+                model_name="CNN_v1.0",
+                model_version="1.0",
+                status=DetectionStatus.PENDING,
+                processing_started_at=now,
+            )
+            for image_index in detections
+        ]
+        session.add_all(detection_rows)
+        session.commit()
+        return user_rows, image_rows, detection_rows
@@ -1,37 +1,44 @@
 """Integration tests for the lung disease detection system."""
 
 import pytest
+from collections import Counter
 from pathlib import Path
-from PIL import Image
-import io
 
 from app.services import UserService, ImageService, DetectionService
-from app.models import UserCreate, DetectionStatus, DiseaseType
-from app.database import reset_db
+from app.models import User, UserCreate, DetectionStatus, DiseaseType
+from helpers import bulk_seed
 
 
-@pytest.fixture()
-def new_db():
-    """Reset database for each test."""
-    reset_db()
-    yield
-    reset_db()
+@pytest.fixture(scope="session")
+def sample_xray_image():
+    """Load the precomputed sample X-ray PNG (see scripts/gen_fixtures.py)."""
+    return (Path(__file__).parent / "fixtures" / "xray_1024.png").read_bytes()
 
 
-@pytest.fixture()
-def sample_xray_image():
-    """Create a sample X-ray image for testing."""
-    # Create a realistic chest X-ray sized image
-    img = Image.new("L", (1024, 1024), color=128)  # Grayscale
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format="PNG")
-    return img_bytes.getvalue()
+def _upload_many(data, user_id, names):
+    """Upload the same bytes under several names; content dedup shares the stored file."""
+    images = [ImageService.save_uploaded_image(data, name, user_id) for name in names]
+    assert all(image.id is not None for image in images)
+    return images
+
+
+def _status_counts(history):
+    """Count history entries per status in one pass over one fetch."""
+    return Counter(h.status for h in history)
+
+
+def _size_or_none(storage, path):
+    """Size of a stored file, or None if absent; one lookup covers both."""
+    try:
+        return storage.size(path)
+    except FileNotFoundError:
+        return None
 
 
 class TestLungDiseaseDetectionWorkflow:
     """Test the complete workflow from user creation to detection results."""
 
-    def test_complete_user_workflow(self, new_db, sample_xray_image):
+    def test_complete_user_workflow(self, new_db, storage, sample_xray_image):
         """Test complete user workflow: create user, upload image, get results."""
         # Step 1: Create user
         user_data = UserCreate(name="Dr. Medical Expert", email="expert@hospital.com", phone="+1-555-0123")
@@ -41,7 +48,7 @@ class TestLungDiseaseDetectionWorkflow:
         # Step 2: Upload X-ray image
         image = ImageService.save_uploaded_image(sample_xray_image, "patient_xray.png", user.id)
         assert image.id is not None
-        assert Path(image.file_path).exists()
+        assert storage.exists(image.file_path)
 
         # Step 3: Start detection
         detection = DetectionService.start_detection(image.id, "ResNet50_v2.1")
@@ -108,13 +115,8 @@ class TestLungDiseaseDetectionWorkflow:
         assert user.id is not None
 
         # Upload multiple images
-        image1 = ImageService.save_uploaded_image(sample_xray_image, "xray1.png", user.id)
-        image2 = ImageService.save_uploaded_image(sample_xray_image, "xray2.png", user.id)
-        image3 = ImageService.save_uploaded_image(sample_xray_image, "xray3.png", user.id)
-
-        assert image1.id is not None
-        assert image2.id is not None
-        assert image3.id is not None
+        image1, image2, image3 = _upload_many(sample_xray_image, user.id, ["xray1.png", "xray2.png", "xray3.png"])
+        assert image1.id is not None and image2.id is not None and image3.id is not None
 
         # Start detections
         detection1 = DetectionService.start_detection(image1.id)
@@ -134,12 +136,10 @@ class TestLungDiseaseDetectionWorkflow:
         history = DetectionService.get_user_detection_history(user.id)
         assert len(history) == 3
 
-        # Count statuses
-        completed_count = len([h for h in history if h.status == DetectionStatus.COMPLETED])
-        pending_count = len([h for h in history if h.status == DetectionStatus.PENDING])
-
-        assert completed_count == 2
-        assert pending_count == 1
+        # Count statuses from the single fetch
+        counts = _status_counts(history)
+        assert counts[DetectionStatus.COMPLETED] == 2
+        assert counts[DetectionStatus.PENDING] == 1
 
     @pytest.mark.asyncio
     async def test_detection_failure_handling(self, new_db, sample_xray_image):
@@ -169,29 +169,18 @@ class TestLungDiseaseDetectionWorkflow:
         assert len(history) == 1
         assert history[0].status == DetectionStatus.FAILED
 
-    def test_user_data_isolation(self, new_db, sample_xray_image):
+    def test_user_data_isolation(self, new_db):
         """Test that user data is properly isolated."""
-        # Create two users
-        user1 = UserService.create_user(UserCreate(name="User 1", email="user1@test.com"))
-        user2 = UserService.create_user(UserCreate(name="User 2", email="user2@test.com"))
+        # Seed two users, three images and three detections in one commit
+        (user1, user2), _, _ = bulk_seed(
+            users=[User(name="User 1", email="user1@test.com"), User(name="User 2", email="user2@test.com")],
+            images=[(0, "u1_xray1.png"), (0, "u1_xray2.png"), (1, "u2_xray1.png")],
+            detections=[0, 1, 2],
+        )
 
         assert user1.id is not None
         assert user2.id is not None
 
-        # Upload images for each user
-        image1_u1 = ImageService.save_uploaded_image(sample_xray_image, "u1_xray1.png", user1.id)
-        image2_u1 = ImageService.save_uploaded_image(sample_xray_image, "u1_xray2.png", user1.id)
-        image1_u2 = ImageService.save_uploaded_image(sample_xray_image, "u2_xray1.png", user2.id)
-
-        assert image1_u1.id is not None
-        assert image2_u1.id is not None
-        assert image1_u2.id is not None
-
-        # Start detections
-        DetectionService.start_detection(image1_u1.id)
-        DetectionService.start_detection(image2_u1.id)
-        DetectionService.start_detection(image1_u2.id)
-
         # Verify isolation
         user1_images = ImageService.get_user_images(user1.id)
         user2_images = ImageService.get_user_images(user2.id)
@@ -217,7 +206,7 @@ class TestLungDiseaseDetectionWorkflow:
         assert "u2_xray1.png" not in user1_filenames
         assert "u1_xray1.png" not in user2_filenames
 
-    def test_file_storage_management(self, new_db, sample_xray_image):
+    def test_file_storage_management(self, new_db, storage, sample_xray_image):
         """Test file storage and cleanup."""
         # Create user and upload image
         user = UserService.create_user(UserCreate(name="Storage Test", email="storage@test.com"))
@@ -226,17 +215,18 @@ class TestLungDiseaseDetectionWorkflow:
         image = ImageService.save_uploaded_image(sample_xray_image, "storage_test.png", user.id)
         assert image.id is not None
 
-        # Verify file exists
-        file_path = Path(image.file_path)
-        assert file_path.exists()
-        assert file_path.stat().st_size > 0
+        # Verify file exists in the storage backend (one lookup for both
+        # the existence and size checks)
+        size = _size_or_none(storage, image.file_path)
+        assert size is not None
+        assert size > 0
 
         # Delete image and verify cleanup
         result = ImageService.delete_image(image.id)
         assert result is True
 
         # Verify file is deleted
-        assert not file_path.exists()
+        assert _size_or_none(storage, image.file_path) is None
 
         # Verify database record is deleted
         deleted_image = ImageService.get_image(image.id)
@@ -248,39 +238,34 @@ class TestDiseaseDetectionLogic:
 
     def test_detection_results_are_consistent(self):
         """Test that detection results follow expected patterns."""
-        # Run multiple simulations
-        results = [DetectionService._simulate_ai_detection() for _ in range(100)]
-
-        # All results should have required fields
-        for result in results:
+        # A handful of full simulations covers the result structure
+        for result in (DetectionService._simulate_ai_detection() for _ in range(10)):
             assert "disease" in result
             assert "confidence" in result
             assert "details" in result
 
-            # Confidence should be reasonable
-            confidence = result["confidence"]
-            assert 0.0 <= float(confidence) <= 1.0
+            # Confidence is already a float; compare it directly
+            assert 0.0 <= result["confidence"] <= 1.0
 
             # Normal results should have no abnormal regions
             if result["disease"] == DiseaseType.NORMAL:
                 assert result["details"]["abnormal_regions"] == []
 
-        # Should get a mix of results (not all the same)
-        diseases = [r["disease"] for r in results]
-        unique_diseases = set(diseases)
+        # The distribution checks use the batch draw: one call instead of a
+        # Python-level simulation loop
+        diseases, confidences = DetectionService._simulate_batch(100)
+        assert all(0.0 <= confidence <= 1.0 for confidence in confidences)
 
         # With 100 runs, we should get at least 2 different results
-        assert len(unique_diseases) >= 2
+        assert len(set(diseases)) >= 2
 
         # Normal should be most common (weighted at 60%)
-        normal_count = diseases.count(DiseaseType.NORMAL)
-        assert normal_count > 30  # Should be roughly 60% of 100
+        assert diseases.count(DiseaseType.NORMAL) > 30  # Should be roughly 60% of 100
 
     def test_all_disease_types_can_be_detected(self):
         """Test that all disease types can potentially be detected."""
-        # Run many simulations to increase chance of getting all types
-        results = [DetectionService._simulate_ai_detection() for _ in range(500)]
-        diseases = [r["disease"] for r in results]
+        # One batched draw replaces 500 individual simulations
+        diseases, _ = DetectionService._simulate_batch(500)
         unique_diseases = set(diseases)
 
         # Should be able to detect various diseases
@@ -2,37 +2,43 @@
 
 import pytest
 from io import BytesIO
-from PIL import Image
 from nicegui.testing import User
 from fastapi.datastructures import Headers, UploadFile
 
-from app.services import UserService
-from app.models import UserCreate
-from app.database import reset_db
 
 # Skip UI tests due to slot stack complexity in test environment
-pytestmark = pytest.mark.skip(reason="UI tests skipped due to slot stack issues in test environment")
-
-
-@pytest.fixture()
-def new_db():
-    """Reset database for each test."""
-    reset_db()
-    yield
-    reset_db()
+pytestmark = [
+    pytest.mark.ui,
+    pytest.mark.skip(reason="UI tests skipped due to slot stack issues in test environment"),
+]
+
+
+# The conftest new_db fixture (savepoint rollback on a session-long schema)
+# replaces the old local reset_db-per-test variant: two full schema rebuilds
+# per test became a transaction rollback.
+
+# Minimal valid 1x1 gray JPEG (PIL-generated offline); these tests only need
+# "a valid image/jpeg" payload, so a 331-byte literal replaces any file read
+_TINY_JPEG = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300100b0c0e0c0a10"
+    "0e0d0e1211101318281a181616183123251d283a333d3c3933383740485c4e40"
+    "4457453738506d51575f626768673e4d71797064785c656763ffc0000b080001"
+    "000101011100ffc4001f00000105010101010101000000000000000001020304"
+    "05060708090a0bffc400b5100002010303020403050504040000017d01020300"
+    "041105122131410613516107227114328191a1082342b1c11552d1f024336272"
+    "82090a161718191a25262728292a3435363738393a434445464748494a535455"
+    "565758595a636465666768696a737475767778797a838485868788898a929394"
+    "95969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7c8c9"
+    "cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda"
+    "0008010100003f002bffd9"
+)
 
 
 @pytest.fixture()
 def sample_image_file():
-    """Create sample image file for upload testing."""
-    # Create a simple test image
-    img = Image.new("RGB", (512, 512), color="gray")
-    img_bytes = BytesIO()
-    img.save(img_bytes, format="JPEG")
-    img_bytes.seek(0)
-
+    """Wrap the tiny JPEG constant as an upload per test."""
     return UploadFile(
-        img_bytes,
+        BytesIO(_TINY_JPEG),
         filename="test_xray.jpg",
         headers=Headers(raw=[(b"content-type", b"image/jpeg")]),
     )
@@ -98,63 +104,18 @@ async def test_user_creation_validation(user: User, new_db) -> None:
     await user.should_see("Nama dan email harus diisi")
 
 
-async def test_detection_page_requires_user(user: User, new_db) -> None:
-    """Test that detection page redirects to user setup if no user."""
-    await user.open("/detection")
-
-    # Should redirect to user setup
-    await user.should_see("Setup Pengguna")
-
-
-async def test_detection_page_with_user(user: User, new_db) -> None:
-    """Test detection page loads with existing user."""
-    # Create user first
-    UserService.create_user(UserCreate(name="Test User", email="test@example.com"))
-
-    await user.open("/detection")
-
-    # Should redirect to user setup since no user in session
-    await user.should_see("Setup Pengguna")
-
-
-async def test_upload_section_displays(user: User, new_db) -> None:
-    """Test that upload section displays correctly."""
-    # Create user
-    UserService.create_user(UserCreate(name="Test User", email="test@example.com"))
-
-    await user.open("/detection")
-
-    # Should redirect to user setup since no user in session
-    await user.should_see("Setup Pengguna")
-
-
-async def test_upload_file_handling(user: User, new_db, sample_image_file) -> None:
-    """Test file upload handling."""
-    # Create user
-    UserService.create_user(UserCreate(name="Test User", email="test@example.com"))
-
-    await user.open("/detection")
-
-    # Should redirect to user setup since no user in session
-    await user.should_see("Setup Pengguna")
-
-
-async def test_history_page_requires_user(user: User, new_db) -> None:
-    """Test that history page redirects to user setup if no user."""
-    await user.open("/history")
-
-    # Should redirect to user setup
-    await user.should_see("Setup Pengguna")
-
-
-async def test_empty_history_display(user: User, new_db) -> None:
-    """Test empty history page display."""
-    # Create user
-    UserService.create_user(UserCreate(name="Test User", email="test@example.com"))
+@pytest.mark.parametrize("url", ["/detection", "/history"])
+async def test_redirects_to_user_setup(user: User, new_db, default_user, url: str) -> None:
+    """Test that pages needing a session user redirect to user setup.
 
-    await user.open("/history")
+    One parametrized test replaces the eight open-URL-and-assert variants,
+    so the NiceGUI user context is spun up once per case instead of per
+    copy. A user record exists (the session-scoped default_user, requested
+    directly so it is committed before new_db patches the session), but
+    nothing is in the browser session, so the redirect must still happen.
+    """
+    await user.open(url)
 
-    # Should redirect to user setup since no user in session
     await user.should_see("Setup Pengguna")
 
 
@@ -168,91 +129,7 @@ async def test_navigation_links(user: User, new_db) -> None:
     await user.should_see("Setup Pengguna")
 
 
-async def test_disease_type_display_logic():
-    """Test disease type display information is correct."""
-
-    # This tests the disease info mapping used in UI
-    disease_info = {
-        "NORMAL": {"color": "text-green-600", "icon": "✅", "label": "Normal"},
-        "PNEUMONIA": {"color": "text-orange-600", "icon": "⚠️", "label": "Pneumonia"},
-        "TUBERCULOSIS": {"color": "text-red-600", "icon": "🦠", "label": "Tuberkulosis"},
-        "COVID19": {"color": "text-purple-600", "icon": "🦠", "label": "COVID-19"},
-        "LUNG_CANCER": {"color": "text-red-800", "icon": "⚠️", "label": "Kanker Paru-paru"},
-    }
-
-    # Verify all required disease types are mapped
-    assert "NORMAL" in disease_info
-    assert "PNEUMONIA" in disease_info
-    assert "TUBERCULOSIS" in disease_info
-    assert "COVID19" in disease_info
-    assert "LUNG_CANCER" in disease_info
-
-    # Verify each mapping has required fields
-    for disease, info in disease_info.items():
-        assert "color" in info
-        assert "icon" in info
-        assert "label" in info
-        assert info["color"].startswith("text-")
-        assert len(info["icon"]) > 0
-        assert len(info["label"]) > 0
-
-
-async def test_status_colors_mapping():
-    """Test status color mapping is complete."""
-    from app.models import DetectionStatus
-
-    status_colors = {
-        DetectionStatus.PENDING: "border-yellow-400 bg-yellow-50",
-        DetectionStatus.PROCESSING: "border-blue-400 bg-blue-50",
-        DetectionStatus.COMPLETED: "border-green-400 bg-green-50",
-        DetectionStatus.FAILED: "border-red-400 bg-red-50",
-    }
-
-    # Verify all status types are mapped
-    for status in DetectionStatus:
-        assert status in status_colors
-        assert "border-" in status_colors[status]
-        assert "bg-" in status_colors[status]
-
-
-class TestUIValidation:
-    """Test UI validation and error handling."""
-
-    async def test_invalid_file_type_handling(self, user: User, new_db):
-        """Test handling of invalid file types."""
-        # Create user
-        UserService.create_user(UserCreate(name="Test User", email="test@example.com"))
-
-        await user.open("/detection")
-
-        # Should redirect to user setup since no user in session
-        await user.should_see("Setup Pengguna")
-
-    async def test_large_file_handling(self, user: User, new_db):
-        """Test handling of files that are too large."""
-        # Create user
-        UserService.create_user(UserCreate(name="Test User", email="test@example.com"))
-
-        await user.open("/detection")
-
-        # Should redirect to user setup since no user in session
-        await user.should_see("Setup Pengguna")
-
-    def test_confidence_score_formatting(self):
-        """Test confidence score formatting logic."""
-        from decimal import Decimal
-
-        # Test different confidence scores
-        test_scores = [Decimal("0.8523"), Decimal("0.9999"), Decimal("0.0001"), Decimal("0.5000")]
-
-        for score in test_scores:
-            # Convert to percentage as done in UI
-            percentage = float(score) * 100
-            formatted = f"{percentage:.1f}%"
-
-            # Verify formatting
-            assert formatted.endswith("%")
-            assert "." in formatted
-            # Should have exactly 1 decimal place
-            decimal_part = formatted.split(".")[1].replace("%", "")
-            assert len(decimal_part) == 1
+# The pure display-logic tests (disease info, status colors, confidence
+# formatting) live in test_ui_logic.py so they keep running while this
+# module is skipped. The old TestUIValidation redirect copies are covered
+# by test_redirects_to_user_setup above.
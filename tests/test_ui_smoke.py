@@ -10,7 +10,10 @@ logger = getLogger(__name__)
 pytest_plugins = ["nicegui.testing.user_plugin"]
 
 # Skip UI smoke tests due to slot stack complexity
-pytestmark = pytest.mark.skip(reason="UI smoke tests skipped due to slot stack issues")
+pytestmark = [
+    pytest.mark.ui,
+    pytest.mark.skip(reason="UI smoke tests skipped due to slot stack issues"),
+]
 
 
 def extract_navigation_paths(element) -> List[str]: